@@ -0,0 +1,144 @@
+"""Persistent per-file cache that lets repeat scans reuse the previous output."""
+
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .file_utils import copy_range
+
+CACHE_FILENAME = ".scanner-cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    output TEXT PRIMARY KEY,
+    size INT,
+    mtime_ns INT
+);
+CREATE TABLE IF NOT EXISTS files (
+    output TEXT,
+    realpath TEXT,
+    size INT,
+    mtime_ns INT,
+    is_binary INT,
+    blob_offset INT,
+    blob_len INT,
+    text_len INT,
+    PRIMARY KEY (output, realpath)
+);
+"""
+
+
+class CachedFile(NamedTuple):
+    """Where a file's rendered content sits in the previous output."""
+
+    size: int
+    mtime_ns: int
+    is_binary: bool
+    blob_offset: int
+    blob_len: int
+    text_len: int
+
+
+class ScanCache:
+    """Maps unchanged files to their content block in the previous scan output."""
+
+    def __init__(self, db_path: Path, output_path: Path):
+        self.output_path = output_path
+        self._output_key = str(output_path)
+        self._entries: Dict[str, CachedFile] = {}
+        self._pending: List[Tuple] = []
+        self._previous_fd: Optional[int] = None
+
+        self._db = sqlite3.connect(db_path, timeout=30)
+        self._db.executescript(_SCHEMA)
+        self._load_previous()
+
+    def _load_previous(self) -> None:
+        """Load entries for this output if the previous output is still the one they describe."""
+        row = self._db.execute("SELECT size, mtime_ns FROM outputs WHERE output = ?", (self._output_key,)).fetchone()
+        try:
+            stat = self.output_path.stat()
+        except OSError:
+            return
+        if row is None or row != (stat.st_size, stat.st_mtime_ns):
+            return
+
+        try:
+            self._previous_fd = os.open(self.output_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except OSError:
+            return
+
+        rows = self._db.execute(
+            "SELECT realpath, size, mtime_ns, is_binary, blob_offset, blob_len, text_len FROM files WHERE output = ?",
+            (self._output_key,),
+        )
+        for realpath, *fields in rows:
+            self._entries[realpath] = CachedFile(*fields)
+
+    @property
+    def has_entries(self) -> bool:
+        """Whether any entries were loaded from the previous scan."""
+        return bool(self._entries)
+
+    def lookup(self, realpath: str, stat: os.stat_result) -> Optional[CachedFile]:
+        """Return the cached entry if the file is unchanged since the last scan."""
+        cached = self._entries.get(realpath)
+        if cached is None or cached.size != stat.st_size or cached.mtime_ns != stat.st_mtime_ns:
+            return None
+        return cached
+
+    def copy_to(self, cached: CachedFile, output_file) -> None:
+        """Append a cached content block from the previous output to output_file."""
+        output_file.flush()
+        copy_range(self._previous_fd, output_file.fileno(), cached.blob_offset, cached.blob_len)
+
+    def record(
+        self,
+        realpath: str,
+        stat: os.stat_result,
+        is_binary: bool,
+        blob_offset: int = 0,
+        blob_len: int = 0,
+        text_len: int = 0,
+    ) -> None:
+        """Queue an entry describing where a file's content landed in the new output."""
+        self._pending.append(
+            (self._output_key, realpath, stat.st_size, stat.st_mtime_ns, is_binary, blob_offset, blob_len, text_len)
+        )
+
+    def release_previous(self) -> None:
+        """Close the previous output so it can be replaced."""
+        if self._previous_fd is not None:
+            os.close(self._previous_fd)
+            self._previous_fd = None
+
+    def save(self) -> None:
+        """Replace this output's entries with the ones recorded during the scan."""
+        try:
+            stat = self.output_path.stat()
+            with self._db:
+                self._db.execute("DELETE FROM files WHERE output = ?", (self._output_key,))
+                self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._pending)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?)",
+                    (self._output_key, stat.st_size, stat.st_mtime_ns),
+                )
+        except (OSError, sqlite3.Error) as exc:
+            print(f"Warning: Could not update scan cache: {exc}", file=sys.stderr)
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Release the previous output and the database connection."""
+        self.release_previous()
+        self._db.close()
+
+
+def open_scan_cache(output_path: Path) -> Optional[ScanCache]:
+    """Open the cache stored next to output_path, or return None if it is unusable."""
+    try:
+        return ScanCache(output_path.parent / CACHE_FILENAME, output_path)
+    except sqlite3.Error as exc:
+        print(f"Warning: Scan cache disabled: {exc}", file=sys.stderr)
+        return None
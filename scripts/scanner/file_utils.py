@@ -1,5 +1,7 @@
 """File utilities shared across scanner implementations."""
 
+import errno
+import os
 from pathlib import Path
 from typing import Iterable, Optional, Set
 
@@ -18,12 +20,38 @@ def is_binary_file(file_path: Path, binary_extensions: Optional[Iterable[str]] =
         return True
 
 
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_size(size_bytes: int) -> str:
     """Return a human-readable size string."""
-    units = ["B", "KB", "MB", "GB", "TB"]
-    value = float(size_bytes)
-    for unit in units:
-        if value < 1024.0 or unit == units[-1]:
-            return f"{value:.2f} {unit}"
-        value /= 1024.0
+    # Each unit is 2**10 of the previous one, so the bit length picks the unit directly.
+    unit = min((max(size_bytes, 1).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit)):.2f} {SIZE_UNITS[unit]}"
+
+
+def copy_range(src_fd: int, dst_fd: int, offset: int, count: int) -> None:
+    """Copy count bytes starting at offset in src_fd to the current position of dst_fd."""
+    # sendfile where the kernel supports file-to-file copies, a read/write loop elsewhere.
+    sendfile = getattr(os, "sendfile", None)
+    while count > 0:
+        if sendfile is not None:
+            try:
+                copied = sendfile(dst_fd, src_fd, offset, count)
+            except OSError as exc:
+                if exc.errno not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP):
+                    raise
+                sendfile = None
+                continue
+        else:
+            os.lseek(src_fd, offset, os.SEEK_SET)
+            chunk = os.read(src_fd, min(count, 1 << 20))
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(dst_fd, view) :]
+            copied = len(chunk)
 
+        if copied == 0:
+            raise OSError(errno.EIO, "source ended before the requested range was copied")
+        offset += copied
+        count -= copied
@@ -1,46 +1,178 @@
 """Lightweight .gitignore parser used by scanners."""
 
-import fnmatch
 import os
+import re
 import sys
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
+
+from .patterns import LastMatcher, compile_ordered_regexes, glob_suffix, partition_patterns
+
+_CASE_INSENSITIVE = os.path.normcase("A") == "a"
+
+
+class GitignoreRule(NamedTuple):
+    """One .gitignore line, translated to a regex over "/"-separated relative paths."""
+
+    pattern: str
+    regex: str
+    dir_only: bool  # trailing "/": only matches directories
+    anchored: bool  # contains a "/": relative to the project root rather than any depth
+    negation: bool
+
+
+def _compile_gitignore_line(line: str) -> Optional[GitignoreRule]:
+    """Translate a .gitignore line into a rule, or return None for blanks and comments."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    negation = line.startswith("!")
+    if negation or line.startswith(("\\!", "\\#")):
+        line = line[1:]
+    if _CASE_INSENSITIVE:
+        line = line.lower()
+
+    pattern = line
+    dir_only = line.endswith("/")
+    if dir_only:
+        line = line[:-1]
+    # Any "/" other than a trailing one anchors the rule to the root; otherwise it matches at any depth.
+    anchored = "/" in line
+    if line.startswith("/"):
+        line = line[1:]
+    segments = line.split("/")
+    if not any(segments):
+        return None
+
+    parts = [] if anchored else ["(?:.*/)?"]
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if len(segment) > 1 and segment.strip("*") == "":
+            # "**" segments span directories: "**/" matches zero or more, a trailing "/**" everything inside.
+            parts.append(".*" if last else "(?:.*/)?")
+            continue
+        parts.append(_translate_segment(segment))
+        if not last:
+            parts.append("/")
+
+    return GitignoreRule(pattern, "".join(parts), dir_only, anchored, negation)
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one path segment of a gitignore glob; wildcards never match "/"."""
+    parts: List[str] = []
+    index, length = 0, len(segment)
+    while index < length:
+        char = segment[index]
+        index += 1
+        if char == "*":
+            if not parts or parts[-1] != "[^/]*":
+                parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "\\" and index < length:
+            parts.append(re.escape(segment[index]))
+            index += 1
+        elif char == "[":
+            end = index
+            if end < length and segment[end] in "!^":
+                end += 1
+            if end < length and segment[end] == "]":
+                end += 1
+            while end < length and segment[end] != "]":
+                end += 2 if segment[end] == "\\" else 1
+            if end >= length:
+                parts.append(r"\[")
+                continue
+            members = segment[index:end]
+            index = end + 1
+            negated = members.startswith(("!", "^"))
+            if negated:
+                members = members[1:]
+            members = re.sub(r"\\(.)", r"\1", members)
+            escaped = "".join(member if member == "-" else re.escape(member) for member in members)
+            parts.append(f"[^/{escaped}]" if negated else f"[{escaped}]")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
 
 
 class GitignoreParser:
     """Parses and applies .gitignore patterns."""
 
     def __init__(self, gitignore_path: Optional[Path] = None):
-        self.patterns: List[Tuple[str, bool]] = []  # (pattern, is_negation)
+        self.rules: List[GitignoreRule] = []
+        # Let callers skip the matcher entirely when it cannot ignore anything.
+        self.empty = True
+        self.only_hidden = True  # every ignore rule targets dot-prefixed names
+        self._suffixes: FrozenSet[str] = frozenset()
+        self._exact: FrozenSet[str] = frozenset()
+        self._file_match: LastMatcher = compile_ordered_regexes([])
+        self._file_negations: Tuple[bool, ...] = ()
+        self._dir_match: LastMatcher = compile_ordered_regexes([])
+        self._dir_negations: Tuple[bool, ...] = ()
         if gitignore_path and gitignore_path.exists():
             self.load(gitignore_path)
 
+    @property
+    def patterns(self) -> List[Tuple[str, bool]]:
+        """The loaded (pattern, is_negation) pairs, in file order."""
+        return [(rule.pattern, rule.negation) for rule in self.rules]
+
     def load(self, gitignore_path: Path) -> None:
         """Load patterns from .gitignore file."""
         try:
             with open(gitignore_path, "r", encoding="utf-8") as handle:
                 for raw_line in handle:
-                    line = raw_line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    is_negation = line.startswith("!")
-                    if is_negation:
-                        line = line[1:]
-
-                    self.patterns.append((line, is_negation))
+                    rule = _compile_gitignore_line(raw_line)
+                    if rule is not None:
+                        self.rules.append(rule)
         except Exception as exc:
             print(f"Warning: Could not load .gitignore: {exc}", file=sys.stderr)
 
-    def should_ignore(self, path: str) -> bool:
-        """Check if a path should be ignored based on .gitignore patterns."""
-        if not self.patterns:
-            return False
+        self._compile()
+
+    def _compile(self) -> None:
+        """Fold the rules into one file matcher and one directory matcher that report the last rule hit."""
+        rules = self.rules
+        self.empty = not rules
+        # A rule with a literal dot-prefixed segment can only match hidden entries or their contents.
+        self.only_hidden = all(
+            any(segment.startswith(".") for segment in rule.pattern.split("/")) for rule in rules if not rule.negation
+        )
+
+        # Without negations rule order is irrelevant, so plain names and
+        # "*.ext" rules that apply at any depth can be served from sets ahead of the regex.
+        if not any(rule.negation for rule in rules):
+            simple = {rule.pattern for rule in rules if not (rule.anchored or rule.dir_only or "\\" in rule.pattern)}
+            self._suffixes, self._exact, globs = partition_patterns(simple)
+            served = simple.difference(globs)
+            rules = [rule for rule in rules if rule.pattern not in served]
 
-        ignored = False
-        for pattern, is_negation in self.patterns:
-            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern):
-                ignored = not is_negation
+        file_rules = [rule for rule in rules if not rule.dir_only]
+        self._file_match = compile_ordered_regexes([rule.regex for rule in file_rules])
+        self._dir_match = compile_ordered_regexes([rule.regex for rule in rules])
+        # Index 0 is unused so the 1-based rule number can be looked up directly.
+        self._file_negations = (False,) + tuple(rule.negation for rule in file_rules)
+        self._dir_negations = (False,) + tuple(rule.negation for rule in rules)
+
+    def should_ignore(self, path: str, is_dir: bool = False) -> bool:
+        """Check if a path relative to the project root should be ignored based on .gitignore patterns."""
+        if self.empty:
+            return False
 
-        return ignored
+        path = os.path.normcase(path)
+        if os.sep != "/":
+            path = path.replace(os.sep, "/")
+        if self._exact or self._suffixes:
+            basename = path[path.rfind("/") + 1 :]
+            if basename in self._exact or glob_suffix(basename) in self._suffixes:
+                return True
 
+        # The last matching pattern wins, so a hit on a negation means "keep".
+        if is_dir:
+            rule = self._dir_match(path)
+            return rule > 0 and not self._dir_negations[rule]
+        rule = self._file_match(path)
+        return rule > 0 and not self._file_negations[rule]
@@ -0,0 +1,176 @@
+"""Glob pattern compilation helpers shared by the scanner matchers, using Hyperscan when installed."""
+
+import fnmatch
+import os
+import re
+from typing import Callable, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator
+    hyperscan = None
+
+# Compiled stand-in for an empty pattern list; an empty union would match everything.
+NEVER_MATCH: Pattern[str] = re.compile(r"(?!)")
+
+# Returns a truthy value when any pattern matches.
+AnyMatcher = Callable[[str], object]
+# Returns the 1-based index of the last pattern that matches, or 0.
+LastMatcher = Callable[[str], int]
+
+_GLOB_METACHARS = frozenset("*?[")
+# Characters that disqualify a pattern from the set-based fast paths.
+_SPECIAL_CHARS = _GLOB_METACHARS | {"/", os.sep}
+
+
+def compile_globs(patterns: Iterable[str]) -> AnyMatcher:
+    """Compile glob patterns into one matcher equivalent to any(fnmatch(...))."""
+    patterns = [os.path.normcase(pattern) for pattern in patterns]
+    if not patterns:
+        return NEVER_MATCH.match
+
+    regex = re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+    database = _hyperscan_database(lambda: ([rf"\A{_glob_to_pcre(pattern)}\z" for pattern in patterns], None))
+    if database is None:
+        return regex.match
+    return _HyperscanMatcher(database, regex.match).any
+
+
+def compile_ordered_regexes(expressions: Sequence[str]) -> LastMatcher:
+    """Compile whole-string regexes into a matcher returning the 1-based index of the last match, or 0."""
+    if not expressions:
+        return _no_match
+
+    # Each expression gets its own capturing group, listed in reverse order, so
+    # match.lastindex names the last matching rule: expression i of n is group n + 1 - i.
+    # Expressions must not capture and should avoid lookarounds so Hyperscan accepts them.
+    regex = re.compile("|".join(f"({expression})" for expression in reversed(expressions)), re.DOTALL)
+    count = len(expressions)
+    regex_fullmatch = regex.fullmatch
+
+    def last_match(text: str) -> int:
+        match = regex_fullmatch(text)
+        return count + 1 - match.lastindex if match else 0
+
+    database = _hyperscan_database(
+        lambda: ([rf"\A(?:{expression})\z" for expression in expressions], list(range(1, count + 1)))
+    )
+    if database is None:
+        return last_match
+    return _HyperscanMatcher(database, last_match).last
+
+
+def _no_match(text: str) -> int:
+    return 0
+
+
+def _glob_to_pcre(pattern: str) -> str:
+    """Translate an fnmatch glob into a PCRE fragment Hyperscan accepts (no lookarounds or atomic groups)."""
+    parts: List[str] = []
+    index, length = 0, len(pattern)
+    while index < length:
+        char = pattern[index]
+        index += 1
+        if char == "*":
+            if not parts or parts[-1] != ".*":
+                parts.append(".*")
+        elif char == "?":
+            parts.append(".")
+        elif char == "[":
+            end = index
+            if end < length and pattern[end] == "!":
+                end += 1
+            if end < length and pattern[end] == "]":
+                end += 1
+            while end < length and pattern[end] != "]":
+                end += 1
+            if end >= length:
+                parts.append(r"\[")
+                continue
+            members = pattern[index:end].replace("\\", "\\\\")
+            index = end + 1
+            if members == "!":
+                parts.append(".")
+            elif members.startswith("!"):
+                parts.append(f"[^{members[1:]}]")
+            elif members.startswith(("^", "[")):
+                parts.append(f"[\\{members}]")
+            else:
+                parts.append(f"[{members}]")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def _hyperscan_database(build: Callable[[], Tuple[List[str], Optional[List[int]]]]):
+    """Compile build()'s (expressions, ids) into a Hyperscan database, or return None to keep the regex."""
+    if hyperscan is None:
+        return None
+    expressions, ids = build()
+    if not all(expression.isascii() for expression in expressions):
+        return None
+
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    flags = hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_SINGLEMATCH
+    try:
+        database.compile(
+            expressions=[expression.encode() for expression in expressions],
+            ids=list(range(len(expressions))) if ids is None else ids,
+            elements=len(expressions),
+            flags=[flags] * len(expressions),
+        )
+    except Exception:  # hyperscan.error: a construct Hyperscan cannot compile; keep the regex
+        return None
+    return database
+
+
+def _collect_match(match_id: int, start: int, end: int, flags: int, context: List[int]) -> None:
+    context.append(match_id)
+
+
+class _HyperscanMatcher:
+    """Scans ASCII text with a Hyperscan database; other text goes to the regex fallback."""
+
+    def __init__(self, database, fallback: Callable):
+        self._database = database
+        self._fallback = fallback
+
+    def _scan(self, text: str) -> Optional[List[int]]:
+        if not text.isascii():
+            return None
+        matches: List[int] = []
+        self._database.scan(text.encode(), match_event_handler=_collect_match, context=matches)
+        return matches
+
+    def any(self, text: str) -> bool:
+        matches = self._scan(text)
+        return bool(self._fallback(text)) if matches is None else bool(matches)
+
+    def last(self, text: str) -> int:
+        matches = self._scan(text)
+        if matches is None:
+            return self._fallback(text)
+        return max(matches, default=0)
+
+
+def glob_suffix(name: str) -> str:
+    """Return the text from the last dot onwards, as a ``*.ext`` glob sees it (``.log`` yields ``.log``)."""
+    index = name.rfind(".")
+    return name[index:] if index >= 0 else ""
+
+
+def partition_patterns(patterns: Iterable[str]) -> Tuple[FrozenSet[str], FrozenSet[str], List[str]]:
+    """Split globs into normcased (``*.ext`` suffixes, exact names, remaining globs)."""
+    suffixes = set()
+    exact = set()
+    globs = []
+    for pattern in patterns:
+        pattern = os.path.normcase(pattern)
+        tail = pattern[2:]
+        if pattern.startswith("*.") and tail and "." not in tail and not _SPECIAL_CHARS.intersection(tail):
+            suffixes.add(pattern[1:])
+        elif not _SPECIAL_CHARS.intersection(pattern):
+            exact.add(pattern)
+        else:
+            globs.append(pattern)
+    return frozenset(suffixes), frozenset(exact), globs
@@ -1,35 +1,157 @@
 """Core implementation for the unified Python scanner."""
 
-import fnmatch
+import io
 import json
+import mmap
 import os
+import queue
+import re
 import sys
-from dataclasses import dataclass, field
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext, redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
-
-from .file_utils import format_size, is_binary_file
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .cache import CachedFile, ScanCache, open_scan_cache
+from .file_utils import copy_range, format_size
 from .gitignore import GitignoreParser
 from .paths import DEFAULT_INPUT_DIR, DEFAULT_OUTPUT_DIR
+from .patterns import AnyMatcher, compile_globs, glob_suffix, partition_patterns
 
 DEFAULT_MAX_FILE_SIZE = 1 * 1024 * 1024
+# Number of file reads kept in flight ahead of the output writer.
+READ_AHEAD = 64
+OUTPUT_BUFFER_SIZE = 1 << 20
+# Files read ahead of the report writer thread.
+WRITE_QUEUE_SIZE = 64
+# Text files above this size are copied into the report with sendfile instead of read().
+MMAP_THRESHOLD = 64 * 1024
+# Bytes that text-mode decoding could change (CR, non-ASCII); files without them copy verbatim.
+_NEEDS_DECODING = re.compile(rb"[\r\x80-\xff]")
+
+RULE = "=" * 80 + "\n"
+FILE_RULE = "=" * 40
+
+
+class _FileSpan(NamedTuple):
+    """An open file whose bytes go into the report verbatim, followed by newline."""
+
+    fd: int
+    size: int
+    newline: bytes
+
+
+class _Block(NamedTuple):
+    """One file handed to the report writer: a cache hit, a _read_file result, or the read's exception."""
+
+    rel_path: str
+    entry: os.DirEntry
+    cache_key: Optional[str]
+    cached: Optional[CachedFile]
+    read: Union[None, Tuple[bool, Optional[Union[bytes, _FileSpan]], int], Exception]
+
+
+def _suffix(filename: str) -> str:
+    """Lowercased Path(filename).suffix, without building a Path."""
+    index = filename.rfind(".")
+    if 0 < index < len(filename) - 1:
+        return filename[index:].lower()
+    return ""
+
+
+def _path_sort_key(rel_path: str) -> str:
+    """String key that orders relative paths like Path comparison does, part by part."""
+    # NUL sorts before every other character, so string order matches tuple-of-parts order.
+    return os.path.normcase(rel_path).replace(os.sep, "\0")
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _prefetch(func: Callable[[_T], _R], items: Iterable[_T], window: int = READ_AHEAD) -> Iterator["Future[_R]"]:
+    """Run func over items on a thread pool, yielding futures in input order with at most window in flight."""
+    with ThreadPoolExecutor() as executor:
+        pending: Deque["Future[_R]"] = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
 
 
 @dataclass
+class ScanStats:
+    """Counters reported for a scan; totals across projects are summed with +=."""
+
+    files_processed: int = 0
+    files_skipped: int = 0
+    total_size: int = 0
+    errors: int = 0
+
+    def __iadd__(self, other: "ScanStats") -> "ScanStats":
+        self.files_processed += other.files_processed
+        self.files_skipped += other.files_skipped
+        self.total_size += other.total_size
+        self.errors += other.errors
+        return self
+
+
+@dataclass(frozen=True)
 class ProjectConfig:
-    """Configuration for scanning a project."""
+    """Configuration for scanning a project; immutable, so derive changes with dataclasses.replace."""
 
     name: str
     project_type: str = "generic"
-    code_extensions: Set[str] = field(default_factory=set)
-    config_files: Set[str] = field(default_factory=set)
-    ignore_dirs: Set[str] = field(default_factory=set)
-    ignore_files: Set[str] = field(default_factory=set)
-    ignore_extensions: Set[str] = field(default_factory=set)
-    ignore_patterns: List[str] = field(default_factory=list)
-    target_subdirs: Set[str] = field(default_factory=set)
+    code_extensions: FrozenSet[str] = frozenset()
+    config_files: FrozenSet[str] = frozenset()
+    ignore_dirs: FrozenSet[str] = frozenset()
+    ignore_files: FrozenSet[str] = frozenset()
+    ignore_extensions: FrozenSet[str] = frozenset()
+    ignore_patterns: Tuple[str, ...] = ()
+    target_subdirs: FrozenSet[str] = frozenset()
     max_file_size: int = DEFAULT_MAX_FILE_SIZE
     include_hidden: bool = False
+    # Derived from ignore_files in __post_init__.
+    ignore_suffixes: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    ignore_exact: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    ignore_glob_match: AnyMatcher = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        ignore_files = frozenset(self.ignore_files)
+        suffixes, exact, glob_match = _compile_ignore_files(ignore_files)
+        object.__setattr__(self, "ignore_files", ignore_files)
+        object.__setattr__(self, "ignore_suffixes", suffixes)
+        object.__setattr__(self, "ignore_exact", exact)
+        object.__setattr__(self, "ignore_glob_match", glob_match)
+
+
+@lru_cache(maxsize=None)
+def _compile_ignore_files(ignore_files: FrozenSet[str]) -> Tuple[FrozenSet[str], FrozenSet[str], AnyMatcher]:
+    """Split ignore_files into suffix and exact-name lookup sets plus a matcher for the remaining globs."""
+    suffixes, exact, globs = partition_patterns(ignore_files)
+    return suffixes, exact, compile_globs(globs)
 
 
 class ProjectDetector:
@@ -49,10 +171,10 @@ class ProjectDetector:
         "spring": ["pom.xml", "application.properties", "application.yml"],
         "rust": ["Cargo.toml", "Cargo.lock", "src/main.rs"],
         "go": ["go.mod", "go.sum", "main.go"],
-        "dotnet": [".csproj", ".sln", ".fsproj", ".vbproj"],
+        "dotnet": ["*.csproj", "*.sln", "*.fsproj", "*.vbproj"],
         "php": ["composer.json", "index.php", "artisan"],
         "laravel": ["composer.json", "artisan", "app/Http"],
-        "ruby": ["Gemfile", "Rakefile", ".rb"],
+        "ruby": ["Gemfile", "Rakefile", "*.rb"],
         "rails": ["Gemfile", "Rakefile", "config/application.rb"],
         "flutter": ["pubspec.yaml", "lib/main.dart", "android", "ios"],
         "docker": ["Dockerfile", "docker-compose.yml"],
@@ -60,31 +182,67 @@ class ProjectDetector:
 
     @staticmethod
     def detect_project_types(project_dir: Path) -> List[str]:
-        """Detect all applicable project types for a directory."""
-        detected_types = []
-
-        for project_type, patterns in ProjectDetector.DETECTION_PATTERNS.items():
-            matches = 0
-            for pattern in patterns:
-                if (project_dir / pattern).exists():
-                    matches += 1
-                elif "*" in pattern and list(project_dir.rglob(pattern)):
-                    matches += 1
-            if matches > 0:
-                detected_types.append(project_type)
-
+        """Detect all applicable project types for a directory, in DETECTION_PATTERNS order."""
+        # Markers live at the project root, so one listing answers names and "*.ext" patterns.
+        try:
+            with os.scandir(project_dir) as iterator:
+                names = {entry.name for entry in iterator}
+        except OSError:
+            names = set()
+
+        found: Set[str] = set()
+        for name in names & _MARKER_TO_TYPES.keys():
+            found.update(_MARKER_TO_TYPES[name])
+        for suffix in {glob_suffix(name) for name in names} & _SUFFIX_MARKER_TO_TYPES.keys():
+            found.update(_SUFFIX_MARKER_TO_TYPES[suffix])
+        for marker, project_types in _NESTED_MARKER_TO_TYPES.items():
+            # Nested markers only touch the disk if they could still add a type.
+            if not found.issuperset(project_types) and marker.split("/", 1)[0] in names:
+                if (project_dir / marker).exists():
+                    found.update(project_types)
+
+        detected_types = [project_type for project_type in ProjectDetector.DETECTION_PATTERNS if project_type in found]
         return detected_types or ["generic"]
 
 
+def _index_detection_patterns(
+    patterns: Dict[str, List[str]]
+) -> Tuple[Dict[str, List[str]], Dict[str, List[str]], Dict[str, List[str]]]:
+    """Invert DETECTION_PATTERNS into (name, "*.ext" suffix, nested path) -> project types tables."""
+    exact: Dict[str, List[str]] = {}
+    suffixes: Dict[str, List[str]] = {}
+    nested: Dict[str, List[str]] = {}
+    for project_type, markers in patterns.items():
+        for marker in markers:
+            if marker.startswith("*"):
+                table, key = suffixes, marker[1:]
+            elif "/" in marker:
+                table, key = nested, marker
+            else:
+                table, key = exact, marker
+            table.setdefault(key, []).append(project_type)
+    return exact, suffixes, nested
+
+
+_MARKER_TO_TYPES, _SUFFIX_MARKER_TO_TYPES, _NESTED_MARKER_TO_TYPES = _index_detection_patterns(
+    ProjectDetector.DETECTION_PATTERNS
+)
+
+
 class ConfigLoader:
     """Loads configuration from various sources."""
 
     @staticmethod
     def load_default_config(project_name: str, project_types: List[str]) -> ProjectConfig:
         """Load default configuration based on detected project types."""
-        config = ProjectConfig(name=project_name)
+        return replace(ConfigLoader._default_config(tuple(project_types)), name=project_name)
 
-        config.code_extensions = {
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _default_config(project_types: Tuple[str, ...]) -> ProjectConfig:
+        """Build the unnamed default configuration shared by projects of the same types."""
+        # The key keeps detection order because the first type is the primary one.
+        code_extensions = {
             ".py",
             ".js",
             ".jsx",
@@ -118,7 +276,7 @@ class ConfigLoader:
             ".bash",
         }
 
-        config.config_files = {
+        config_files = {
             "package.json",
             "tsconfig.json",
             "webpack.config.js",
@@ -144,7 +302,7 @@ class ConfigLoader:
             ".gitignore",
         }
 
-        config.ignore_dirs = {
+        ignore_dirs = {
             "node_modules",
             "dist",
             "build",
@@ -180,7 +338,7 @@ class ConfigLoader:
             ".pub-cache",
         }
 
-        config.ignore_files = {
+        ignore_files = {
             ".DS_Store",
             "Thumbs.db",
             "desktop.ini",
@@ -199,7 +357,7 @@ class ConfigLoader:
             ".env.production",
         }
 
-        config.ignore_extensions = {
+        ignore_extensions = {
             ".pyc",
             ".pyo",
             ".pyd",
@@ -232,33 +390,42 @@ class ConfigLoader:
             ".gz",
         }
 
+        target_subdirs = set()
         primary_type = project_types[0] if project_types else "generic"
-        config.project_type = primary_type
 
         if "python" in project_types or "django" in project_types:
-            config.target_subdirs = {"src", "app", "backend", "back"}
-            config.code_extensions.update({".pyx", ".pyi"})
+            target_subdirs = {"src", "app", "backend", "back"}
+            code_extensions.update({".pyx", ".pyi"})
 
         if "nodejs" in project_types or "react" in project_types or "vue" in project_types:
-            config.target_subdirs = {"src", "lib", "components", "pages"}
-            config.code_extensions.update({".mjs", ".cjs", ".vue"})
+            target_subdirs = {"src", "lib", "components", "pages"}
+            code_extensions.update({".mjs", ".cjs", ".vue"})
 
         if "java" in project_types or "spring" in project_types:
-            config.target_subdirs = {"src/main/java", "src/main/resources", "src"}
-            config.ignore_dirs.update({"target", ".gradle", ".mvn"})
+            target_subdirs = {"src/main/java", "src/main/resources", "src"}
+            ignore_dirs.update({"target", ".gradle", ".mvn"})
 
         if "rust" in project_types:
-            config.target_subdirs = {"src"}
-            config.ignore_dirs.add("target")
+            target_subdirs = {"src"}
+            ignore_dirs.add("target")
 
         if "go" in project_types:
-            config.target_subdirs = {"pkg", "cmd", "internal"}
+            target_subdirs = {"pkg", "cmd", "internal"}
 
         if "flutter" in project_types:
-            config.target_subdirs = {"lib"}
-            config.ignore_dirs.update({".dart_tool", "build", "android", "ios"})
-
-        return config
+            target_subdirs = {"lib"}
+            ignore_dirs.update({".dart_tool", "build", "android", "ios"})
+
+        return ProjectConfig(
+            name="",
+            project_type=primary_type,
+            code_extensions=frozenset(code_extensions),
+            config_files=frozenset(config_files),
+            ignore_dirs=frozenset(ignore_dirs),
+            ignore_files=frozenset(ignore_files),
+            ignore_extensions=frozenset(ignore_extensions),
+            target_subdirs=frozenset(target_subdirs),
+        )
 
     @staticmethod
     def load_from_file(config_file: Path, base_config: ProjectConfig) -> ProjectConfig:
@@ -267,22 +434,23 @@ class ConfigLoader:
             with open(config_file, "r", encoding="utf-8") as handle:
                 data = json.load(handle)
 
+            changes = {}
             if "code_extensions" in data:
-                base_config.code_extensions.update(set(data["code_extensions"]))
+                changes["code_extensions"] = base_config.code_extensions | set(data["code_extensions"])
             if "ignore_dirs" in data:
-                base_config.ignore_dirs.update(set(data["ignore_dirs"]))
+                changes["ignore_dirs"] = base_config.ignore_dirs | set(data["ignore_dirs"])
             if "ignore_files" in data:
-                base_config.ignore_files.update(set(data["ignore_files"]))
+                changes["ignore_files"] = base_config.ignore_files | set(data["ignore_files"])
             if "ignore_extensions" in data:
-                base_config.ignore_extensions.update(set(data["ignore_extensions"]))
+                changes["ignore_extensions"] = base_config.ignore_extensions | set(data["ignore_extensions"])
             if "target_subdirs" in data:
-                base_config.target_subdirs = set(data["target_subdirs"])
+                changes["target_subdirs"] = frozenset(data["target_subdirs"])
             if "max_file_size" in data:
-                base_config.max_file_size = data["max_file_size"]
+                changes["max_file_size"] = data["max_file_size"]
             if "include_hidden" in data:
-                base_config.include_hidden = data["include_hidden"]
+                changes["include_hidden"] = data["include_hidden"]
 
-            return base_config
+            return replace(base_config, **changes)
         except Exception as exc:
             print(f"Warning: Could not load config file {config_file}: {exc}", file=sys.stderr)
             return base_config
@@ -291,64 +459,75 @@ class ConfigLoader:
 class UnifiedScanner:
     """Main scanner class that handles project scanning."""
 
-    def __init__(self, config: ProjectConfig, project_dir: Path):
+    def __init__(self, config: ProjectConfig, project_dir: Path, cache: Optional[ScanCache] = None):
         self.config = config
         self.project_dir = project_dir
+        # Resolved once; cache keys for non-symlink files are built on top of it.
+        self._real_root = os.path.realpath(str(project_dir))
+        self.cache = cache
         self.gitignore = GitignoreParser(project_dir / ".gitignore")
-        self.stats = {
-            "files_processed": 0,
-            "files_skipped": 0,
-            "total_size": 0,
-            "errors": 0,
-        }
+        # Rules that only name dotfiles are redundant while hidden entries are skipped anyway.
+        self._skip_gitignore = self.gitignore.empty or (not config.include_hidden and self.gitignore.only_hidden)
+        self.stats = ScanStats()
+        # (depth, name, is_dir, is_last) for every kept entry, in the order the tree is printed.
+        self._tree_events: List[Tuple[int, str, bool, bool]] = []
 
-    def should_ignore_file(self, file_path: Path) -> Tuple[bool, str]:
+    def should_ignore_file(self, entry: os.DirEntry, rel_path: str) -> Tuple[bool, str]:
         """Check if a file should be ignored. Returns (should_ignore, reason)."""
-        rel_path = file_path.relative_to(self.project_dir)
-        filename = file_path.name
-        ext = file_path.suffix.lower()
+        # Cheapest checks first: name and set lookups, then the size limit, then the regexes.
+        filename = entry.name
 
         if not self.config.include_hidden and filename.startswith("."):
             return True, "hidden file"
 
-        if self.gitignore.should_ignore(str(rel_path)):
-            return True, "in .gitignore"
-
-        for pattern in self.config.ignore_files:
-            if fnmatch.fnmatch(filename, pattern):
-                return True, f"matches ignore pattern: {pattern}"
-
+        ext = _suffix(filename)
         if ext in self.config.ignore_extensions:
             return True, f"ignored extension: {ext}"
 
+        normalized = os.path.normcase(filename)
+        suffix = glob_suffix(normalized)
+        if suffix in self.config.ignore_suffixes:
+            return True, f"matches ignore pattern: *{suffix}"
+
+        if normalized in self.config.ignore_exact:
+            return True, f"matches ignore pattern: {filename}"
+
         try:
-            if file_path.stat().st_size > self.config.max_file_size:
+            # Kept files need their stat later anyway and DirEntry caches it, so
+            # only files rejected by the patterns below pay for it early.
+            if entry.stat().st_size > self.config.max_file_size:
                 return True, f"file too large (>{self.config.max_file_size} bytes)"
         except OSError:
             return True, "cannot stat file"
 
+        if not self._skip_gitignore and self.gitignore.should_ignore(rel_path):
+            return True, "in .gitignore"
+
+        if self.config.ignore_glob_match(normalized):
+            return True, "matches ignore pattern"
+
         return False, ""
 
-    def should_ignore_dir(self, dir_path: Path) -> Tuple[bool, str]:
+    def should_ignore_dir(self, entry: os.DirEntry, rel_path: str) -> Tuple[bool, str]:
         """Check if a directory should be ignored. Returns (should_ignore, reason)."""
-        dirname = dir_path.name
-        rel_path = dir_path.relative_to(self.project_dir)
+        dirname = entry.name
 
         if not self.config.include_hidden and dirname.startswith("."):
             return True, "hidden directory"
 
-        if self.gitignore.should_ignore(str(rel_path)):
-            return True, "in .gitignore"
-
+        # Cheap set lookup first: node_modules and friends never reach the gitignore regex.
         if dirname in self.config.ignore_dirs:
             return True, f"in ignore list: {dirname}"
 
+        if not self._skip_gitignore and self.gitignore.should_ignore(rel_path, is_dir=True):
+            return True, "in .gitignore"
+
         return False, ""
 
-    def should_include_file(self, file_path: Path) -> bool:
+    def should_include_entry(self, entry: os.DirEntry) -> bool:
         """Check if file content should be included in output."""
-        filename = file_path.name
-        ext = file_path.suffix.lower()
+        filename = entry.name
+        ext = _suffix(filename)
 
         if filename in self.config.config_files:
             return True
@@ -361,107 +540,306 @@ class UnifiedScanner:
 
         return False
 
-    def scan_directory(self, output_file) -> Dict[str, int]:
+    def scan_directory(self, output_file) -> ScanStats:
         """Scan directory and write to output file."""
-        files_to_process: List[Path] = []
+        files_to_process: List[Tuple[str, str, os.DirEntry]] = []  # (sort_key, rel_path, entry)
+        self._tree_events = []
+
+        for entry, rel_path in self._iter_tree(str(self.project_dir), ""):
+            if self.should_include_entry(entry):
+                files_to_process.append((_path_sort_key(rel_path), rel_path, entry))
+
+        files_to_process.sort(key=itemgetter(0))
+
+        sections = [
+            f"{RULE} Project: {self.config.name}\n Type: {self.config.project_type}\n",
+            f" Path: {self.project_dir}\n Files to process: {len(files_to_process)}\n{RULE}\n",
+            f"{RULE} Project Structure\n{RULE}\n",
+        ]
+        self._render_tree(sections)
+        sections.append(f"\n\n{RULE} File Contents\n{RULE}\n")
+        output_file.write("".join(sections).encode())
+
+        cache = self.cache
+        # Unchanged files are copied from the previous output; only the rest are read.
+        cache_keys: List[Optional[str]] = [
+            self._cache_key(entry, rel_path) if cache else None for _, rel_path, entry in files_to_process
+        ]
+        cached_files: List[Optional[CachedFile]] = [None] * len(files_to_process)
+        if cache and cache.has_entries:
+            cached_files = [cache.lookup(key, entry.stat()) for key, (_, _, entry) in zip(cache_keys, files_to_process)]
+        misses = [entry.path for (_, _, entry), cached in zip(files_to_process, cached_files) if cached is None]
+        reads = _prefetch(self._read_file, misses)
+
+        # This thread resolves reads in order while a writer thread appends each finished
+        # file to the report, so waiting on the next read overlaps the previous write.
+        blocks: "queue.Queue[Optional[_Block]]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        written = ScanStats()
+        failures: List[BaseException] = []
+        writer = threading.Thread(
+            target=self._write_blocks, args=(blocks, output_file, written, failures), name="scan-writer"
+        )
+        writer.start()
+        try:
+            for (_, rel_path, entry), cache_key, cached in zip(files_to_process, cache_keys, cached_files):
+                read = None
+                if cached is None:
+                    try:
+                        read = next(reads).result()
+                    except Exception as exc:
+                        read = exc
+                blocks.put(_Block(rel_path, entry, cache_key, cached, read))
+        finally:
+            blocks.put(None)
+            writer.join()
+        if failures:
+            raise failures[0]
+
+        # Files rejected during the walk were already counted in self.stats.
+        self.stats += written
+        stats = self.stats
+        summary = (
+            f"\n{RULE} Summary\n{RULE}"
+            f"Files processed: {stats.files_processed}\n"
+            f"Files skipped: {stats.files_skipped}\n"
+            f"Total size: {format_size(stats.total_size)}\n"
+            f"Errors: {stats.errors}\n{RULE}"
+        )
+        output_file.write(summary.encode())
 
-        for root, dirs, files in os.walk(self.project_dir):
-            root_path = Path(root)
-            dirs_to_remove = []
+        return self.stats
 
-            for dirname in dirs:
-                dir_path = root_path / dirname
-                should_ignore, _ = self.should_ignore_dir(dir_path)
-                if should_ignore:
-                    dirs_to_remove.append(dirname)
+    def _write_blocks(
+        self,
+        blocks: "queue.Queue[Optional[_Block]]",
+        output_file,
+        stats: ScanStats,
+        failures: List[BaseException],
+    ) -> None:
+        """Writer thread: append queued files to output_file until the None sentinel."""
+        cache = self.cache
+        # Plain locals in the per-file loop; folded into stats once at the end.
+        files_processed = files_skipped = total_size = errors = 0
 
-            for dirname in dirs_to_remove:
-                dirs.remove(dirname)
+        try:
+            for rel_path, entry, cache_key, cached, read in iter(blocks.get, None):
+                try:
+                    if isinstance(read, Exception):
+                        raise read
+                    if cached is None:
+                        is_binary, blob, text_len = read
+                    else:
+                        is_binary, blob, text_len = cached.is_binary, b"", cached.text_len
+
+                    if is_binary:
+                        output_file.write(f"--- {rel_path} (BINARY - SKIPPED) ---\n\n".encode())
+                        files_skipped += 1
+                        # An unreadable file (blob None) may be readable next time, so it is never cached.
+                        if cache and blob is not None:
+                            cache.record(cache_key, entry.stat(), True)
+                        continue
+
+                    header = f"--- {rel_path} ---\n\n".encode()
+                    footer = f"\n{FILE_RULE} End of {rel_path} {FILE_RULE}\n\n".encode()
+                    if cached is not None:
+                        output_file.write(header)
+                        blob_offset = output_file.tell()
+                        cache.copy_to(cached, output_file)
+                        output_file.write(footer)
+                        blob_len = cached.blob_len
+                    elif isinstance(blob, _FileSpan):
+                        try:
+                            output_file.write(header)
+                            blob_offset = output_file.tell()
+                            output_file.flush()
+                            copy_range(blob.fd, output_file.fileno(), 0, blob.size)
+                        finally:
+                            os.close(blob.fd)
+                        output_file.write(blob.newline + footer)
+                        blob_len = blob.size + len(blob.newline)
+                    else:
+                        blob_offset = output_file.tell() + len(header) if cache else 0
+                        output_file.write(b"".join((header, blob, footer)))
+                        blob_len = len(blob)
+                    if cache:
+                        cache.record(cache_key, entry.stat(), False, blob_offset, blob_len, text_len)
+
+                    files_processed += 1
+                    total_size += text_len
+
+                except Exception as exc:
+                    output_file.write(f"--- {rel_path} (ERROR) ---\nError reading file: {exc}\n\n".encode())
+                    errors += 1
+        except BaseException as exc:
+            # Keep draining after a fatal error so the producer never blocks on a full queue.
+            failures.append(exc)
+            for block in iter(blocks.get, None):
+                if isinstance(block.read, tuple) and isinstance(block.read[1], _FileSpan):
+                    os.close(block.read[1].fd)
+        finally:
+            stats += ScanStats(files_processed, files_skipped, total_size, errors)
+
+    def _cache_key(self, entry: os.DirEntry, rel_path: str) -> str:
+        """Key cache rows on the absolute, dereferenced path of the file."""
+        # The walk never descends into symlinked directories, so only the file itself can be a link.
+        if entry.is_symlink():
+            return os.path.realpath(entry.path)
+        return self._real_root + os.sep + rel_path
 
-            for filename in files:
-                file_path = root_path / filename
-                should_ignore, _ = self.should_ignore_file(file_path)
+    @staticmethod
+    def _read_file(file_path: str) -> Tuple[bool, Optional[Union[bytes, _FileSpan]], int]:
+        """Return (is_binary, report bytes, text_length) for a file; the content is None if it cannot be read."""
+        try:
+            with open(file_path, "rb") as handle:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                size = os.fstat(handle.fileno()).st_size
+                if size > MMAP_THRESHOLD:
+                    # Large pure-ASCII files go into the report by sendfile without passing through Python.
+                    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                        if view.find(b"\x00", 0, 1024) != -1:
+                            return True, b"", 0
+                        if not _NEEDS_DECODING.search(view):
+                            newline = b"" if view[-1:] == b"\n" else b"\n"
+                            return False, _FileSpan(os.dup(handle.fileno()), size, newline), size
+                data = handle.read()
+        except (OSError, ValueError):
+            # Fail closed like is_binary_file: never risk dumping unreadable data.
+            return True, None, 0
+
+        if b"\x00" in data[:1024]:
+            return True, b"", 0
+
+        # Match text-mode reading: lenient UTF-8 plus universal newlines.
+        try:
+            content = data.decode("utf-8")
+            clean = "\r" not in content
+        except UnicodeDecodeError:
+            content = data.decode("utf-8", errors="ignore")
+            clean = False
+        if not clean:
+            # Re-encode only when decoding changed something; clean files are written as read.
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+            data = content.encode()
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        return False, data, len(content)
+
+    def _iter_tree(self, directory: str, rel_dir: str, depth: int = 0) -> Iterator[Tuple[os.DirEntry, str]]:
+        """Yield (entry, rel_path) for every non-ignored file under directory, recording the tree as it goes."""
+        # Entries are visited in tree order (directories first, then by name) so is_last is known.
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(((not entry.is_dir(), entry.name, entry) for entry in iterator), key=itemgetter(0, 1))
+        except OSError:
+            return
+
+        kept = []
+        for is_file, _, entry in entries:
+            rel_path = rel_dir + entry.name
+            if is_file:
+                should_ignore, _ = self.should_ignore_file(entry, rel_path)
                 if should_ignore:
-                    self.stats["files_skipped"] += 1
+                    self.stats.files_skipped += 1
                     continue
-
-                if self.should_include_file(file_path):
-                    files_to_process.append(file_path)
-
-        files_to_process.sort()
-
-        output_file.write("=" * 80 + "\n")
-        output_file.write(f" Project: {self.config.name}\n")
-        output_file.write(f" Type: {self.config.project_type}\n")
-        output_file.write(f" Path: {self.project_dir}\n")
-        output_file.write(f" Files to process: {len(files_to_process)}\n")
-        output_file.write("=" * 80 + "\n\n")
-
-        output_file.write("=" * 80 + "\n")
-        output_file.write(" Project Structure\n")
-        output_file.write("=" * 80 + "\n\n")
-        self._write_tree(self.project_dir, output_file)
-        output_file.write("\n\n")
-
-        output_file.write("=" * 80 + "\n")
-        output_file.write(" File Contents\n")
-        output_file.write("=" * 80 + "\n\n")
-
-        for file_path in files_to_process:
-            rel_path = file_path.relative_to(self.project_dir)
-            try:
-                if is_binary_file(file_path):
-                    output_file.write(f"--- {rel_path} (BINARY - SKIPPED) ---\n\n")
-                    self.stats["files_skipped"] += 1
+            else:
+                # Pruned here, so ignored directories are never opened.
+                should_ignore, _ = self.should_ignore_dir(entry, rel_path)
+                if should_ignore:
                     continue
+            kept.append((entry, rel_path, not is_file))
+
+        last_index = len(kept) - 1
+        for index, (entry, rel_path, is_dir) in enumerate(kept):
+            self._tree_events.append((depth, entry.name, is_dir, index == last_index))
+            if not is_dir:
+                yield entry, rel_path
+            elif not entry.is_symlink():  # like os.walk, symlinked directories are not descended into
+                yield from self._iter_tree(entry.path, rel_path + os.sep, depth + 1)
+
+    def _render_tree(self, lines: List[str]) -> None:
+        """Append directory tree lines for the events recorded by _iter_tree."""
+        # prefixes[depth] is the indentation for entries at that depth, derived from
+        # whether each enclosing directory was the last entry of its parent.
+        prefixes = [""]
+        for depth, name, is_dir, is_last in self._tree_events:
+            prefix = prefixes[depth]
+            connector = "└── " if is_last else "├── "
+            lines.append(f"{prefix}{connector}{name}{'/' if is_dir else ''}\n")
+
+            if is_dir:
+                del prefixes[depth + 1 :]
+                prefixes.append(prefix + ("    " if is_last else "│   "))
+
+
+def _scan_project(project_path: Path, output_dir: Path) -> Optional[ScanStats]:
+    """Detect, configure and scan one project. Returns its stats, or None on failure."""
+    project_name = project_path.name
+    print(f"\n{'=' * 80}")
+    print(f"Processing: {project_name}")
+    print(f"{'=' * 80}")
 
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as handle:
-                    content = handle.read()
-
-                output_file.write(f"--- {rel_path} ---\n\n")
-                output_file.write(content)
-                if not content.endswith("\n"):
-                    output_file.write("\n")
-                output_file.write("\n" + "=" * 40 + f" End of {rel_path} " + "=" * 40 + "\n\n")
-
-                self.stats["files_processed"] += 1
-                self.stats["total_size"] += len(content)
-
-            except Exception as exc:
-                output_file.write(f"--- {rel_path} (ERROR) ---\n")
-                output_file.write(f"Error reading file: {exc}\n\n")
-                self.stats["errors"] += 1
-
-        output_file.write("\n" + "=" * 80 + "\n")
-        output_file.write(" Summary\n")
-        output_file.write("=" * 80 + "\n")
-        output_file.write(f"Files processed: {self.stats['files_processed']}\n")
-        output_file.write(f"Files skipped: {self.stats['files_skipped']}\n")
-        output_file.write(f"Total size: {format_size(self.stats['total_size'])}\n")
-        output_file.write(f"Errors: {self.stats['errors']}\n")
-        output_file.write("=" * 80 + "\n")
-
-        return self.stats
-
-    def _write_tree(self, directory: Path, output_file, prefix: str = "", is_last: bool = True) -> None:
-        """Write directory tree structure."""
+    print("Detecting project types...")
+    project_types = ProjectDetector.detect_project_types(project_path)
+    print(f"Detected types: {', '.join(project_types)}")
+
+    print("Loading configuration...")
+    config = ConfigLoader.load_default_config(project_name, project_types)
+
+    config_file = project_path / ".scanner-config.json"
+    if config_file.exists():
+        print(f"Found custom config: {config_file}")
+        config = ConfigLoader.load_from_file(config_file, config)
+
+    output_filename = output_dir / f"{project_name}_unified_scan.txt"
+    # The cache copies unchanged content out of the previous output, so write
+    # the new one alongside it and swap it in once the scan has finished.
+    temp_filename = output_filename.with_name(output_filename.name + ".tmp")
+    print("Scanning project...")
+    cache = open_scan_cache(output_filename)
+    scanner = UnifiedScanner(config, project_path, cache)
+
+    try:
+        with open(temp_filename, "wb", buffering=OUTPUT_BUFFER_SIZE) as outfile:
+            stats = scanner.scan_directory(outfile)
+
+        if cache:
+            cache.release_previous()
+        os.replace(temp_filename, output_filename)
+        if cache:
+            cache.save()
+
+        print("✓ Successfully scanned!")
+        print(f"  Files processed: {stats.files_processed}")
+        print(f"  Files skipped: {stats.files_skipped}")
+        print(f"  Total size: {format_size(stats.total_size)}")
+        print(f"  Errors: {stats.errors}")
+        print(f"  Output: {output_filename}")
+        return stats
+
+    except Exception as exc:
+        print(f"✗ Error scanning project: {exc}", file=sys.stderr)
+        import traceback
+
+        traceback.print_exc()
+        return None
+
+    finally:
+        if cache:
+            cache.close()
         try:
-            items = sorted(directory.iterdir(), key=lambda path: (not path.is_dir(), path.name))
-        except OSError:
-            return
+            os.unlink(temp_filename)
+        except FileNotFoundError:
+            pass
 
-        for index, item in enumerate(items):
-            is_last_item = index == len(items) - 1
-            should_ignore, _ = (self.should_ignore_dir(item) if item.is_dir() else self.should_ignore_file(item))
-            if should_ignore:
-                continue
-
-            connector = "└── " if is_last_item else "├── "
-            output_file.write(f"{prefix}{connector}{item.name}{'/' if item.is_dir() else ''}\n")
 
-            if item.is_dir():
-                extension = "    " if is_last_item else "│   "
-                self._write_tree(item, output_file, prefix + extension, is_last_item)
+def _scan_one_project(project_path: Path, output_dir: Path) -> Tuple[Optional[ScanStats], str, str]:
+    """Process-pool worker: scan a project and return (stats, stdout, stderr)."""
+    # Captured so the parent prints each project's log as one block, not interleaved.
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        stats = _scan_project(project_path, output_dir)
+    return stats, stdout.getvalue(), stderr.getvalue()
 
 
 def run_unified_scanner(input_dir: Path = DEFAULT_INPUT_DIR, output_dir: Path = DEFAULT_OUTPUT_DIR) -> int:
@@ -490,60 +868,35 @@ def run_unified_scanner(input_dir: Path = DEFAULT_INPUT_DIR, output_dir: Path =
         return 1
 
     success_count = 0
-    total_stats = {"files_processed": 0, "files_skipped": 0, "total_size": 0, "errors": 0}
-
-    for project_path in sorted(projects):
-        project_name = project_path.name
-        print(f"\n{'=' * 80}")
-        print(f"Processing: {project_name}")
-        print(f"{'=' * 80}")
-
-        print("Detecting project types...")
-        project_types = ProjectDetector.detect_project_types(project_path)
-        print(f"Detected types: {', '.join(project_types)}")
-
-        print("Loading configuration...")
-        config = ConfigLoader.load_default_config(project_name, project_types)
-
-        config_file = project_path / ".scanner-config.json"
-        if config_file.exists():
-            print(f"Found custom config: {config_file}")
-            config = ConfigLoader.load_from_file(config_file, config)
-
-        output_filename = output_dir / f"{project_name}_unified_scan.txt"
-        print("Scanning project...")
-        scanner = UnifiedScanner(config, project_path)
-
-        try:
-            with open(output_filename, "w", encoding="utf-8") as outfile:
-                stats = scanner.scan_directory(outfile)
-
-            print("✓ Successfully scanned!")
-            print(f"  Files processed: {stats['files_processed']}")
-            print(f"  Files skipped: {stats['files_skipped']}")
-            print(f"  Total size: {format_size(stats['total_size'])}")
-            print(f"  Errors: {stats['errors']}")
-            print(f"  Output: {output_filename}")
-
-            for key in total_stats:
-                total_stats[key] += stats[key]
+    total_stats = ScanStats()
+
+    # Projects are independent, so scan them in parallel and print each log in order.
+    projects.sort()
+    workers = min(len(projects), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        if executor:
+            results = executor.map(_scan_one_project, projects, repeat(output_dir))
+        else:
+            # A single scan has nothing to interleave with, so let it print live.
+            results = ((_scan_project(project, output_dir), "", "") for project in projects)
+        for stats, stdout, stderr in results:
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            if stats is None:
+                continue
 
+            total_stats += stats
             success_count += 1
 
-        except Exception as exc:
-            print(f"✗ Error scanning project: {exc}", file=sys.stderr)
-            import traceback
-
-            traceback.print_exc()
-
     print(f"\n{'=' * 80}")
     print("COMPLETED!")
     print(f"{'=' * 80}")
     print(f"Projects processed: {success_count}/{len(projects)}")
-    print(f"Total files processed: {total_stats['files_processed']}")
-    print(f"Total files skipped: {total_stats['files_skipped']}")
-    print(f"Total size: {format_size(total_stats['total_size'])}")
-    print(f"Total errors: {total_stats['errors']}")
+    print(f"Total files processed: {total_stats.files_processed}")
+    print(f"Total files skipped: {total_stats.files_skipped}")
+    print(f"Total size: {format_size(total_stats.total_size)}")
+    print(f"Total errors: {total_stats.errors}")
     print(f"Output directory: {output_dir}")
     print(f"{'=' * 80}")
 